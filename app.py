@@ -1,13 +1,24 @@
+import time
+
+STARTED = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 
-from pipeline.ingestion import load_schedule
-from pipeline.scheduler import get_time_window
-from pipeline.silence_detection import mark_silence_windows
-from pipeline.baseline import compute_silence_baseline
+from pipeline.ingestion import load_usage_logs, load_schedule
+from pipeline.scheduler import get_silent_window, compile_schedule, index_by_building
+from pipeline.silence_detection import mark_silence_compiled
+from pipeline.baseline import init_baseline_state, update_baseline_state, baseline_from_state
 from pipeline.anomaly import detect_shadow_waste
 from pipeline.decision import generate_decision
+from pipeline.reading_log import open_reading_log, load_dictionary, records_to_frame, is_log_fresh
+from pipeline.snapshot import load_snapshot, is_snapshot_fresh
+
+USAGE_CSV = "data/usage_logs_full.csv"
+SCHEDULE_CSV = "data/demo/schedule.csv"
+READING_LOG = "data/usage_logs_full.bin"
+SNAPSHOT = "data/snapshot"
 
 
 # ============================================================
@@ -35,9 +46,14 @@ st.divider()
 # Session State Initialization
 # ============================================================
 if "usage_df" not in st.session_state:
-    usage_df = pd.read_csv("data/usage_logs_full.csv")
-    usage_df["timestamp"] = pd.to_datetime(usage_df["timestamp"])
+    # Warm start: map the binary reading log written by check_cycle.py
+    # instead of re-parsing the CSV, unless the CSV changed since
+    if is_log_fresh(READING_LOG, [USAGE_CSV]):
+        usage_df = records_to_frame(open_reading_log(READING_LOG), load_dictionary(READING_LOG))
+    else:
+        usage_df = load_usage_logs(USAGE_CSV, validate=True, schedule_df=load_schedule(SCHEDULE_CSV))
     st.session_state.usage_df = usage_df
+    st.session_state.usage_index = index_by_building(usage_df)
 
     st.session_state.current_time = (
         usage_df["timestamp"].min() + timedelta(minutes=30)
@@ -53,6 +69,9 @@ if "decision_history" not in st.session_state:
 if "anomaly_history" not in st.session_state:
     st.session_state.anomaly_history = []
 
+if "baseline_state" not in st.session_state:
+    st.session_state.baseline_state = init_baseline_state()
+
 
 # ============================================================
 # Sidebar Controls
@@ -64,11 +83,27 @@ run_one_day = st.sidebar.button("⏩ Run ALL Cycles (1 Day)")
 
 st.sidebar.caption("Each cycle represents a scheduled 30-minute run")
 
+if "time_to_first_cycle" in st.session_state:
+    st.sidebar.caption(
+        f"⏱️ Time to first cycle: {st.session_state.time_to_first_cycle * 1000:.0f} ms"
+    )
+
 
 # ============================================================
 # Load Schedule
 # ============================================================
-schedule = load_schedule("data/demo/schedule.csv")
+if "schedule" not in st.session_state:
+    # Warm start: reuse the compiled schedule from the snapshot, if it
+    # was built from this schedule and it has not changed since
+    if is_snapshot_fresh(SNAPSHOT, [USAGE_CSV, SCHEDULE_CSV]):
+        st.session_state.schedule = load_snapshot(SNAPSHOT)["schedule"]
+    else:
+        st.session_state.schedule = compile_schedule(load_schedule(SCHEDULE_CSV))
+
+schedule = st.session_state.schedule
+
+if "startup_seconds" not in st.session_state:
+    st.session_state.startup_seconds = time.perf_counter() - STARTED
 
 
 # ============================================================
@@ -76,30 +111,35 @@ schedule = load_schedule("data/demo/schedule.csv")
 # ============================================================
 def run_single_cycle():
 
+    cycle_started = time.perf_counter()
     usage_df = st.session_state.usage_df
     current_time = st.session_state.current_time
 
     if current_time > st.session_state.end_time:
         return False
 
-    # 1️⃣ Extract time window
-    window_df = get_time_window(
+    # 1️⃣ Extract time window, silent buildings only
+    # (active buildings can never be anomalies, so they are skipped)
+    window_df = get_silent_window(
         usage_df,
         current_time,
-        window_minutes=30
+        schedule,
+        window_minutes=30,
+        index=st.session_state.usage_index
     )
 
+    st.session_state.cycle_count += 1
     if window_df.empty:
         st.session_state.current_time += timedelta(minutes=30)
+        record_first_cycle(cycle_started)
         return True
 
     # 2️⃣ Silence detection
-    window_df = mark_silence_windows(window_df, schedule)
+    window_df = mark_silence_compiled(window_df, schedule)
 
-    # 3️⃣ Baseline from historical data
-    historical_df = usage_df[usage_df["timestamp"] < current_time]
-    historical_df = mark_silence_windows(historical_df, schedule)
-    baseline = compute_silence_baseline(historical_df)
+    # 3️⃣ Baseline: fold this window into the running state
+    update_baseline_state(st.session_state.baseline_state, window_df)
+    baseline = baseline_from_state(st.session_state.baseline_state)
 
     # 4️⃣ Anomaly detection
     result = detect_shadow_waste(window_df, baseline)
@@ -108,7 +148,6 @@ def run_single_cycle():
     st.session_state.anomaly_history.append(result)
 
     # 5️⃣ Decisions
-    st.session_state.cycle_count += 1
     for _, row in result.iterrows():
         if row["is_anomaly"]:
             decision_raw = generate_decision(row)
@@ -124,9 +163,18 @@ def run_single_cycle():
             st.session_state.decision_history.append(decision)
     # Advance time
     st.session_state.current_time += timedelta(minutes=30)
+    record_first_cycle(cycle_started)
     return True
 
 
+def record_first_cycle(cycle_started):
+    # Startup (imports + data load) plus the first cycle itself
+    if "time_to_first_cycle" not in st.session_state:
+        st.session_state.time_to_first_cycle = (
+            st.session_state.startup_seconds + time.perf_counter() - cycle_started
+        )
+
+
 # ============================================================
 # Button Actions
 # ============================================================
@@ -163,7 +211,7 @@ st.header("📊 Simulation Results")
 #     st.info("Run one or more cycles to view results.")
 #     st.stop()
 
-if not st.session_state.anomaly_history:
+if st.session_state.cycle_count == 0:
     st.info("Run one or more cycles to view results.")
     st.stop()
 
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 def compute_silence_baseline(
@@ -18,4 +19,78 @@ def compute_silence_baseline(
         .rename(columns={"usage": "baseline_usage"})
     ) 
 
-    return baseline
\ No newline at end of file
+    return baseline
+
+
+def init_baseline_state() -> dict:
+    """
+    Creates an empty running baseline.
+    Holds silence usage sums and counts per (building, resource).
+    """
+    return {
+        "buildings": [],
+        "resources": [],
+        "usage_sum": np.zeros((0, 0), dtype="float64"),
+        "usage_count": np.zeros((0, 0), dtype="int64"),
+    }
+
+
+def update_baseline_state(
+    state: dict,
+    usage_df: pd.DataFrame
+) -> dict:
+    """
+    Adds the silence rows of usage_df to a running baseline.
+    Feeding every window once gives the same result as
+    compute_silence_baseline over the full history.
+    """
+
+    silence_df = usage_df[usage_df["is_silence"] == True]
+    if silence_df.empty:
+        return state
+
+    b_idx = _state_index(state["buildings"], silence_df["building"])
+    r_idx = _state_index(state["resources"], silence_df["resource"])
+
+    # Grow the tables for newly seen buildings / resources
+    shape = (len(state["buildings"]), len(state["resources"]))
+    if shape != state["usage_sum"].shape:
+        pad = [(0, shape[0] - state["usage_sum"].shape[0]),
+               (0, shape[1] - state["usage_sum"].shape[1])]
+        state["usage_sum"] = np.pad(state["usage_sum"], pad)
+        state["usage_count"] = np.pad(state["usage_count"], pad)
+
+    np.add.at(state["usage_sum"], (b_idx, r_idx), silence_df["usage"].to_numpy(dtype="float64"))
+    np.add.at(state["usage_count"], (b_idx, r_idx), 1)
+
+    return state
+
+
+def baseline_from_state(state: dict) -> pd.DataFrame:
+    """
+    Reads the current baseline out of a running state.
+    Same columns as compute_silence_baseline.
+    """
+
+    b_idx, r_idx = np.nonzero(state["usage_count"])
+
+    baseline = pd.DataFrame({
+        "building": np.asarray(state["buildings"], dtype=object)[b_idx],
+        "resource": np.asarray(state["resources"], dtype=object)[r_idx],
+        "baseline_usage": state["usage_sum"][b_idx, r_idx] / state["usage_count"][b_idx, r_idx],
+    })
+
+    return baseline
+
+
+def _state_index(names: list, values: pd.Series) -> np.ndarray:
+    # Position of each value in names, registering unseen ones
+    codes, uniques = pd.factorize(values)
+    index = {name: i for i, name in enumerate(names)}
+    for name in uniques:
+        if name not in index:
+            index[name] = len(names)
+            names.append(name)
+
+    lookup = np.array([index[name] for name in uniques], dtype="int64")
+    return lookup[codes]
\ No newline at end of file
@@ -1,16 +1,45 @@
 # pipeline/ingestion.py
 
+import numpy as np
 import pandas as pd
 
 
-def load_usage_logs(filepath: str) -> pd.DataFrame:
+REQUIRED_COLUMNS = ["timestamp", "building", "resource", "usage"]
+METER_KEY = ["building", "resource"]
+
+# A reading this many times above its meter's median is treated as a
+# sensor spike rather than waste (real shadow waste stays well below it).
+SPIKE_FACTOR = 100
+
+# A register that drops after reading at least this fraction of its
+# capacity rolled over; any other drop is a counter reset to zero.
+
+# Quarantine reasons, indexed by the int8 code used during validation
+REJECT_REASONS = ["", "missing_value", "negative_usage", "unknown_building", "spike"]
+
+
+def load_usage_logs(
+    filepath: str,
+    validate: bool = False,
+    schedule_df: pd.DataFrame = None,
+    interval_minutes: int = 30
+) -> pd.DataFrame:
     """
     Load meter usage logs.
     Expected columns:
     timestamp, building, resource, usage
+
+    With validate=True the rows go through validate_usage_logs and
+    only the clean rows are returned; the validation stats are kept
+    in df.attrs["validation"].
     """
     df = pd.read_csv(filepath)
 
+    if validate:
+        df, report = validate_usage_logs(df, schedule_df, interval_minutes=interval_minutes)
+        df.attrs["validation"] = report["stats"]
+        return df
+
     # Parse timestamp
     df["timestamp"] = pd.to_datetime(df["timestamp"])
 
@@ -30,3 +59,265 @@ def load_schedule(filepath: str) -> pd.DataFrame:
     df["end_time"] = pd.to_datetime(df["end_time"], format="%H:%M").dt.time
 
     return df
+
+
+def load_cumulative_logs(
+    filepath: str,
+    interval_minutes: int = 30,
+    rollover=None,
+    max_usage=None
+) -> pd.DataFrame:
+    """
+    Load cumulative meter register logs as interval usage.
+    Expected columns:
+    timestamp, building, resource, reading
+    """
+    df = pd.read_csv(filepath)
+
+    # Parse timestamp
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+
+    return convert_cumulative_readings(df, interval_minutes, rollover, max_usage)
+
+
+def convert_cumulative_readings(
+    readings_df: pd.DataFrame,
+    interval_minutes: int = 30,
+    rollover=None,
+    max_usage=None
+) -> pd.DataFrame:
+    """
+    Converts cumulative register readings into per-interval usage.
+
+    Readings are sorted per meter and diffed in one pass. A drop in
+    the register is a rollover when the meter's capacity is known
+    (rollover: a number, or a dict by resource), unless the rolled-over
+    delta is more than the meter could plausibly use (max_usage per
+    interval_minutes, same form); otherwise the counter was reset and
+    the new reading is the consumption since the reset. Each delta is
+    rate-normalised to interval_minutes and stamped with the reading
+    that reported it, matching the per-interval 'usage' logs.
+    """
+    meter_key = _meter_key(readings_df)
+    meter_codes, _ = _encode_meters(readings_df, meter_key)
+
+    ts = readings_df["timestamp"].to_numpy(dtype="datetime64[ns]").view("int64")
+    reading = readings_df["reading"].to_numpy(dtype="float64")
+
+    # Sort by meter, then time, and diff neighbours
+    order = np.lexsort((ts, meter_codes))
+    ts_sorted = ts[order]
+    reading_sorted = reading[order]
+
+    same_meter = meter_codes[order][1:] == meter_codes[order][:-1]
+    elapsed = np.diff(ts_sorted)
+    delta = np.diff(reading_sorted)
+    current = reading_sorted[1:]
+    interval_ns = int(pd.Timedelta(minutes=interval_minutes).value)
+
+    # Counter drops: rollover if capacity is known and the wrapped
+    # delta is plausible for the time elapsed, otherwise a reset
+    capacity = _per_resource(readings_df["resource"], rollover)[order][1:]
+    max_delta = (
+        _per_resource(readings_df["resource"], max_usage)[order][1:]
+        * np.maximum(elapsed, 1) / interval_ns
+    )
+    dropped = delta < 0
+    rolled = dropped & np.isfinite(capacity) & (delta + capacity <= max_delta)
+    delta = np.where(rolled, delta + capacity, delta)
+    delta = np.where(dropped & ~rolled, current, delta)
+
+    keep = same_meter & (elapsed > 0) & ~np.isnan(delta)
+
+    reported = order[1:][keep]
+    usage_df = readings_df.iloc[reported][meter_key].reset_index(drop=True)
+    usage_df.insert(0, "timestamp", readings_df["timestamp"].to_numpy()[reported])
+    usage_df["usage"] = delta[keep] * interval_ns / elapsed[keep]
+
+    return usage_df
+
+
+def _per_resource(resource: pd.Series, value) -> np.ndarray:
+    # Per-row limit from a number or a dict by resource; inf where unknown
+    if value is None:
+        return np.full(len(resource), np.inf)
+
+    if not isinstance(value, dict):
+        return np.full(len(resource), float(value))
+
+    codes, uniques = pd.factorize(resource)
+    lookup = np.array([value.get(r, np.inf) for r in uniques] + [np.inf], dtype="float64")
+    return lookup[codes]
+
+
+def validate_usage_logs(
+    usage_df: pd.DataFrame,
+    schedule_df: pd.DataFrame = None,
+    interval_minutes: int = 30,
+    spike_factor: float = SPIKE_FACTOR,
+    baseline_df: pd.DataFrame = None
+) -> tuple:
+    """
+    Cleans raw usage logs before they reach the baseline.
+
+    Quarantines malformed rows, then deduplicates the remaining rows
+    on (timestamp, building, resource[, meter]) keeping the latest
+    valid upload, and flags missing intervals per meter. Every pass
+    is a vectorized column operation.
+
+    Spikes are judged against each meter's median within this batch,
+    which only works for batches holding several readings per meter.
+    For streaming windows (often one reading per meter) pass
+    baseline_df (compute_silence_baseline / baseline_from_state) and
+    its 'baseline_usage' is used as the reference instead.
+
+    Returns:
+        (clean_df, report) where report is a dict with
+        'quarantine' (rejected rows + 'reason'), 'gaps' and 'stats'.
+    """
+    missing_cols = [c for c in REQUIRED_COLUMNS if c not in usage_df.columns]
+    if missing_cols:
+        raise ValueError(f"Usage logs missing columns: {missing_cols}")
+
+    df = usage_df.reset_index(drop=True)
+    rows_in = len(df)
+
+    # Encode strings once; every later pass works on integer codes
+    meter_key = _meter_key(df)
+    meter_codes, key_codes = _encode_meters(df, meter_key)
+    building_codes, buildings = key_codes["building"]
+
+    timestamp = pd.to_datetime(df["timestamp"], errors="coerce")
+    ts = timestamp.to_numpy(dtype="datetime64[ns]").view("int64")
+    usage = pd.to_numeric(df["usage"], errors="coerce").to_numpy(dtype="float64")
+
+    # 1️⃣ Reject malformed rows, first matching reason wins
+    reason = np.zeros(len(df), dtype="int8")
+
+    missing = np.isnat(timestamp.to_numpy()) | np.isnan(usage)
+    for codes, _ in key_codes.values():
+        missing |= codes < 0
+    reason[missing] = 1
+
+    negative = ~missing & (usage < 0)
+    reason[negative] = 2
+
+    if schedule_df is not None:
+        known_buildings = np.append(buildings.isin(schedule_df["building"].unique()), False)
+        unknown = (reason == 0) & ~known_buildings[building_codes]
+        reason[unknown] = 3
+
+    # 2️⃣ Deduplicate among well-formed rows (latest valid upload wins),
+    # so a malformed re-upload cannot displace a good reading
+    dup_mask = np.zeros(len(df), dtype=bool)
+    candidates = np.flatnonzero(reason == 0)
+    dup_mask[candidates] = (
+        pd.DataFrame({"t": ts[candidates], "m": meter_codes[candidates]})
+        .duplicated(keep="last").to_numpy()
+    )
+    duplicates = int(dup_mask.sum())
+
+    valid = (reason == 0) & ~dup_mask
+    if spike_factor:
+        if baseline_df is not None:
+            reference = (
+                df[METER_KEY]
+                .merge(baseline_df[METER_KEY + ["baseline_usage"]], on=METER_KEY, how="left")
+                ["baseline_usage"].to_numpy(dtype="float64")
+            )
+        else:
+            reference = (
+                pd.Series(usage).where(valid)
+                .groupby(meter_codes, sort=False)
+                .transform("median")
+                .to_numpy(dtype="float64")
+            )
+        spike = valid & (reference > 0) & (usage > reference * spike_factor)
+        reason[spike] = 4
+        valid &= ~spike
+
+    rejected = ~valid & ~dup_mask
+    quarantine = df[rejected].assign(
+        reason=np.array(REJECT_REASONS, dtype=object)[reason[rejected]]
+    )
+
+    clean_df = df[valid].assign(
+        timestamp=timestamp[valid],
+        usage=usage[valid]
+    ).reset_index(drop=True)
+
+    # 3️⃣ Gap detection per meter
+    gaps = _find_gaps(clean_df, meter_codes[valid], ts[valid], interval_minutes)
+
+    stats = {
+        "rows_in": rows_in,
+        "rows_out": len(clean_df),
+        "duplicates": duplicates,
+        "quarantined": len(quarantine),
+        "quarantined_by_reason": quarantine["reason"].value_counts().to_dict(),
+        "gaps": len(gaps),
+        "missing_intervals": int(gaps["missing_intervals"].sum()),
+    }
+
+    report = {
+        "quarantine": quarantine.reset_index(drop=True),
+        "gaps": gaps,
+        "stats": stats,
+    }
+
+    return clean_df, report
+
+
+def detect_gaps(
+    usage_df: pd.DataFrame,
+    interval_minutes: int = 30
+) -> pd.DataFrame:
+    """
+    Finds missing intervals per (building, resource[, meter]) meter.
+    Returns one row per gap with the readings on either side of it.
+    """
+    usage_df = usage_df.reset_index(drop=True)
+    meter_codes, _ = _encode_meters(usage_df, _meter_key(usage_df))
+    ts = usage_df["timestamp"].to_numpy(dtype="datetime64[ns]").view("int64")
+
+    return _find_gaps(usage_df, meter_codes, ts, interval_minutes)
+
+
+def _find_gaps(usage_df, meter_codes, ts, interval_minutes):
+    # Sort by meter, then time, and compare neighbours
+    order = np.lexsort((ts, meter_codes))
+    meter_sorted = meter_codes[order]
+    ts_sorted = ts[order]
+
+    interval_ns = int(pd.Timedelta(minutes=interval_minutes).value)
+    step = np.diff(ts_sorted)
+    is_gap = (meter_sorted[1:] == meter_sorted[:-1]) & (step > interval_ns)
+
+    before = order[:-1][is_gap]
+    after = order[1:][is_gap]
+
+    gaps = pd.DataFrame({
+        col: usage_df[col].to_numpy()[before] for col in _meter_key(usage_df)
+    })
+    gaps["gap_start"] = usage_df["timestamp"].to_numpy()[before]
+    gaps["gap_end"] = usage_df["timestamp"].to_numpy()[after]
+    gaps["missing_intervals"] = np.ceil(step[is_gap] / interval_ns).astype("int64") - 1
+
+    return gaps
+
+
+def _meter_key(df: pd.DataFrame) -> list:
+    # Sub-meters are distinct meters once a 'meter' column exists
+    return METER_KEY + (["meter"] if "meter" in df.columns else [])
+
+
+def _encode_meters(df: pd.DataFrame, meter_key: list) -> tuple:
+    # One int64 code per meter, plus each key column's (codes, uniques)
+    meter_codes = np.zeros(len(df), dtype="int64")
+    key_codes = {}
+    for col in meter_key:
+        codes, uniques = pd.factorize(df[col])
+        meter_codes = meter_codes * (len(uniques) + 1) + codes
+        key_codes[col] = (codes, uniques)
+
+    return meter_codes, key_codes
@@ -0,0 +1,201 @@
+# pipeline/reading_log.py
+
+import bisect
+import json
+import os
+
+import numpy as np
+
+
+LOG_VERSION = 1
+
+# Fixed-width, packed record: 17 bytes per reading
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<i8"),   # ns since epoch
+    ("building", "<i4"),    # index into dictionary["buildings"]
+    ("resource", "i1"),     # index into dictionary["resources"]
+    ("usage", "<f4"),
+])
+
+MAX_RESOURCES = np.iinfo("int8").max
+
+
+def dictionary_path(log_path: str) -> str:
+    return f"{log_path}.dict.json"
+
+
+def load_dictionary(log_path: str) -> dict:
+    """
+    Load the id -> name dictionary stored next to a reading log.
+    """
+    path = dictionary_path(log_path)
+    if not os.path.exists(path):
+        return {"version": LOG_VERSION, "buildings": [], "resources": []}
+
+    with open(path) as f:
+        dictionary = json.load(f)
+
+    if dictionary.get("version") != LOG_VERSION:
+        raise ValueError(f"Unsupported reading log version: {dictionary.get('version')}")
+
+    return dictionary
+
+
+def source_stamps(paths: list) -> dict:
+    """
+    Size and modification time of each source file, keyed by absolute
+    path, so files derived from them can tell when they are stale.
+    """
+    stamps = {}
+    for path in paths:
+        stat = os.stat(path)
+        stamps[os.path.abspath(path)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return stamps
+
+
+def sources_match(recorded: dict, paths: list) -> bool:
+    """
+    True if recorded stamps (from source_stamps) describe exactly
+    these source files as they are now.
+    """
+    try:
+        return recorded == source_stamps(paths)
+    except FileNotFoundError:
+        return False
+
+
+def is_log_fresh(log_path: str, sources: list) -> bool:
+    """
+    True if the reading log exists and was written from exactly these
+    source files, none of which has changed since.
+    """
+    if not os.path.exists(log_path):
+        return False
+    return sources_match(load_dictionary(log_path).get("sources"), sources)
+
+
+def append_readings(log_path: str, usage_df, sources: dict = None) -> int:
+    """
+    Appends usage rows to a binary reading log.
+
+    Rows are sorted by timestamp and must not start before the last
+    record already on disk, so the log stays time-ordered and windows
+    can be found with a binary search. A partial trailing record left
+    by an interrupted write is discarded first. sources, the
+    source_stamps of the files the rows came from (taken before
+    reading them), are recorded in the dictionary for is_log_fresh.
+
+    Returns:
+        int: Number of records appended
+    """
+    if usage_df.empty:
+        return 0
+
+    dictionary = load_dictionary(log_path)
+
+    ts = usage_df["timestamp"].to_numpy(dtype="datetime64[ns]").view("int64")
+    order = np.argsort(ts, kind="stable")
+
+    building_ids = _encode(usage_df["building"], dictionary["buildings"])
+    resource_ids = _encode(usage_df["resource"], dictionary["resources"])
+    if len(dictionary["resources"]) > MAX_RESOURCES:
+        raise ValueError(f"Reading log supports at most {MAX_RESOURCES} resources")
+
+    records = np.empty(len(usage_df), dtype=RECORD_DTYPE)
+    records["timestamp"] = ts[order]
+    records["building"] = building_ids[order]
+    records["resource"] = resource_ids[order]
+    records["usage"] = usage_df["usage"].to_numpy(dtype="float32")[order]
+
+    if sources:
+        dictionary.setdefault("sources", {}).update(sources)
+
+    existing = open_reading_log(log_path)
+    if len(existing) and records["timestamp"][0] < existing["timestamp"][-1]:
+        raise ValueError("Readings are older than the end of the log; the log is append-only")
+
+    # Dictionary first, so readers never see an id without its name
+    tmp_path = dictionary_path(log_path) + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(dictionary, f)
+    os.replace(tmp_path, dictionary_path(log_path))
+
+    # Drop any torn tail from an interrupted write, so the new records
+    # start on a record boundary
+    with open(log_path, "r+b" if os.path.exists(log_path) else "wb") as f:
+        end = len(existing) * RECORD_DTYPE.itemsize
+        f.truncate(end)
+        f.seek(end)
+        f.write(records.tobytes())
+
+    return len(records)
+
+
+def open_reading_log(log_path: str) -> np.ndarray:
+    """
+    Memory-maps a reading log read-only.
+
+    Every process mapping the same file shares the OS page cache.
+    A trailing partial record (a write in progress) is ignored.
+    """
+    if not os.path.exists(log_path):
+        return np.empty(0, dtype=RECORD_DTYPE)
+
+    n_records = os.path.getsize(log_path) // RECORD_DTYPE.itemsize
+    if n_records == 0:
+        return np.empty(0, dtype=RECORD_DTYPE)
+
+    return np.memmap(log_path, dtype=RECORD_DTYPE, mode="r", shape=(n_records,))
+
+
+def get_record_window(records: np.ndarray, current_time, window_minutes=30) -> np.ndarray:
+    """
+    Same window as scheduler.get_time_window, on a mapped log.
+    Returns a zero-copy slice of the records.
+    """
+    end = np.datetime64(current_time, "ns").astype("int64")
+    start = end - window_minutes * 60 * 10**9
+
+    # bisect probes single records; np.searchsorted would first copy
+    # the whole strided timestamp column out of the mapping
+    ts = records["timestamp"]
+    lo = bisect.bisect_left(ts, start)
+    hi = bisect.bisect_left(ts, end, lo=lo)
+
+    return records[lo:hi]
+
+
+def records_to_frame(records: np.ndarray, dictionary: dict):
+    """
+    Decodes records into the usage DataFrame the pipeline stages expect.
+    """
+    import pandas as pd
+
+    buildings = np.asarray(dictionary["buildings"], dtype=object)
+    resources = np.asarray(dictionary["resources"], dtype=object)
+
+    return pd.DataFrame({
+        "timestamp": records["timestamp"].astype("datetime64[ns]"),
+        "building": buildings[records["building"]],
+        "resource": resources[records["resource"]],
+        "usage": records["usage"].astype("float64"),
+    })
+
+
+def _encode(values, names: list) -> np.ndarray:
+    # Map names to ids, registering unseen names at the end of the list
+    import pandas as pd
+
+    codes, uniques = pd.factorize(values)
+    if (codes < 0).any():
+        raise ValueError("Reading log rows need a building and resource")
+
+    ids = {name: i for i, name in enumerate(names)}
+    lookup = np.empty(len(uniques), dtype="int64")
+    for i, name in enumerate(uniques.astype(str).tolist()):
+        if name not in ids:
+            ids[name] = len(names)
+            names.append(name)
+        lookup[i] = ids[name]
+
+    return lookup[codes]
@@ -1,5 +1,9 @@
 from datetime import timedelta
 
+import numpy as np
+
+DAY_SECONDS = 24 * 3600
+
 def get_time_window(df, current_time, window_minutes=30):
     """
     Extracts a time window ending at current_time.
@@ -20,3 +24,177 @@ def get_time_window(df, current_time, window_minutes=30):
     ]
 
     return window_df
+
+
+def compile_schedule(schedule_df):
+    """
+    Compiles the silence ('NO') rows of a schedule into arrays.
+
+    Args:
+        schedule_df (DataFrame): Output of load_schedule
+
+    Returns:
+        dict: 'buildings' (names) and (n_buildings, k) arrays of
+        silence window 'start'/'end' in seconds of day, padded with
+        'valid' = False
+    """
+    silence = schedule_df[schedule_df["expected_activity"] == "NO"]
+    buildings = list(dict.fromkeys(schedule_df["building"].dropna()))
+    index = {name: i for i, name in enumerate(buildings)}
+
+    windows = [[] for _ in buildings]
+    for building, start, end in zip(silence["building"], silence["start_time"], silence["end_time"]):
+        windows[index[building]].append((_seconds_of_day(start), _seconds_of_day(end)))
+
+    k = max([len(w) for w in windows] + [1])
+    compiled = {
+        "buildings": buildings,
+        "start": np.zeros((len(buildings), k), dtype="int32"),
+        "end": np.zeros((len(buildings), k), dtype="int32"),
+        "valid": np.zeros((len(buildings), k), dtype=bool),
+    }
+    for i, building_windows in enumerate(windows):
+        for j, (start, end) in enumerate(building_windows):
+            compiled["start"][i, j] = start
+            compiled["end"][i, j] = end
+            compiled["valid"][i, j] = True
+
+    return compiled
+
+
+def silence_mask(compiled, building_codes, seconds):
+    """
+    Vectorized is_time_in_window over every reading.
+
+    Args:
+        compiled (dict): Output of compile_schedule
+        building_codes (ndarray): Position in compiled['buildings'], -1 if unknown
+        seconds (ndarray): Seconds of day of each reading
+
+    Returns:
+        ndarray: True where the reading falls in a silence window
+    """
+    known = building_codes >= 0
+    codes = np.where(known, building_codes, 0)
+
+    start = compiled["start"][codes]
+    end = compiled["end"][codes]
+    sec = np.asarray(seconds)[:, None]
+
+    # Same rule as is_time_in_window, including overnight windows
+    inside = np.where(
+        start <= end,
+        (start <= sec) & (sec <= end),
+        (sec >= start) | (sec <= end)
+    )
+
+    return (inside & compiled["valid"][codes]).any(axis=1) & known
+
+
+def get_silent_buildings(compiled, current_time, window_minutes=30):
+    """
+    Buildings with a silence window overlapping the time window
+    ending at current_time. Only their readings can be anomalies.
+
+    Args:
+        compiled (dict): Output of compile_schedule
+        current_time (datetime): End of window
+        window_minutes (int): Window size in minutes
+
+    Returns:
+        list: Building names, in compiled order
+    """
+    length = window_minutes * 60
+    start = _seconds_of_day(current_time - timedelta(minutes=window_minutes))
+
+    # Window as half-open [lo, hi) segments of the day
+    if length >= DAY_SECONDS:
+        segments = [(0, DAY_SECONDS)]
+    elif start + length <= DAY_SECONDS:
+        segments = [(start, start + length)]
+    else:
+        segments = [(start, DAY_SECONDS), (0, start + length - DAY_SECONDS)]
+
+    s = compiled["start"]
+    e = compiled["end"]
+    overnight = s > e
+
+    # Silence windows are closed [s, e], or [s, midnight) + [0, e] overnight
+    hit = np.zeros(s.shape, dtype=bool)
+    for lo, hi in segments:
+        hit |= np.where(
+            overnight,
+            (s < hi) | (lo <= e),
+            (s < hi) & (lo <= e)
+        )
+
+    silent = (hit & compiled["valid"]).any(axis=1)
+    return [b for b, is_silent in zip(compiled["buildings"], silent) if is_silent]
+
+
+def index_by_building(df):
+    """
+    Indexes a usage dataset once by (building, timestamp) so each
+    building's readings are a contiguous, time-sorted run.
+
+    Args:
+        df (DataFrame): Full usage dataset
+
+    Returns:
+        dict: 'rows' (positions in df, sorted by building then time),
+        'timestamp' (ns, in the same order) and 'offsets'
+        ({building: (first, stop)} into both arrays)
+    """
+    import pandas as pd
+
+    codes, buildings = pd.factorize(df["building"])
+    ts = df["timestamp"].to_numpy(dtype="datetime64[ns]").view("int64")
+    rows = np.lexsort((ts, codes))
+
+    bounds = np.searchsorted(codes[rows], np.arange(len(buildings) + 1))
+    offsets = {
+        building: (int(bounds[i]), int(bounds[i + 1]))
+        for i, building in enumerate(buildings)
+    }
+
+    return {"rows": rows, "timestamp": np.ascontiguousarray(ts[rows]), "offsets": offsets}
+
+
+def get_silent_window(df, current_time, compiled, window_minutes=30, index=None):
+    """
+    get_time_window restricted to buildings in a silence period.
+    Skips the data entirely when the whole campus is active.
+
+    With index (index_by_building(df)), each silent building's window
+    is found by binary search, so the cost scales with the silent
+    buildings rather than the whole dataset.
+
+    Returns:
+        DataFrame: Filtered window data (possibly empty), in df order
+    """
+    silent_buildings = get_silent_buildings(compiled, current_time, window_minutes)
+    if not silent_buildings:
+        return df.iloc[0:0]
+
+    if index is None:
+        window_df = get_time_window(df, current_time, window_minutes)
+        return window_df[window_df["building"].isin(silent_buildings)]
+
+    end = np.datetime64(current_time, "ns").astype("int64")
+    start = end - window_minutes * 60 * 10**9
+
+    ts = index["timestamp"]
+    runs = []
+    for building in silent_buildings:
+        if building not in index["offsets"]:
+            continue
+        first, stop = index["offsets"][building]
+        lo, hi = first + np.searchsorted(ts[first:stop], [start, end])
+        runs.append(index["rows"][lo:hi])
+
+    rows = np.sort(np.concatenate(runs)) if runs else []
+    return df.iloc[rows]
+
+
+def _seconds_of_day(t):
+    return t.hour * 3600 + t.minute * 60 + t.second
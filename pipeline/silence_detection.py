@@ -1,6 +1,8 @@
 from datetime import time
 import pandas as pd
 
+from pipeline.scheduler import silence_mask
+
 
 def is_time_in_window(check_time: time, start: time, end: time) -> bool:
     """
@@ -39,4 +41,23 @@ def mark_silence_windows(
                 ):
                     usage_df.at[idx, "is_silence"] = True
 
-    return usage_df
\ No newline at end of file
+    return usage_df
+
+
+def mark_silence_compiled(
+    usage_df: pd.DataFrame,
+    compiled: dict
+) -> pd.DataFrame:
+    """
+    Same as mark_silence_windows, using a compiled schedule.
+    """
+
+    usage_df = usage_df.copy()
+
+    codes = pd.Index(compiled["buildings"]).get_indexer(usage_df["building"])
+    ts = usage_df["timestamp"]
+    seconds = (ts.dt.hour * 3600 + ts.dt.minute * 60 + ts.dt.second).to_numpy()
+
+    usage_df["is_silence"] = silence_mask(compiled, codes, seconds)
+
+    return usage_df
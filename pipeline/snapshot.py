@@ -0,0 +1,290 @@
+# pipeline/snapshot.py
+#
+# Only numpy is imported here, so a warm start never pays for pandas.
+
+import fcntl
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from pipeline.scheduler import get_silent_buildings, silence_mask
+from pipeline.reading_log import get_record_window, sources_match
+
+
+SNAPSHOT_VERSION = 1
+MANIFEST = "manifest.json"
+LOCK = ".lock"
+
+# (array name, mmap mode); baseline tables are copy-on-write so the
+# next cycle can update them without touching the files
+ARRAYS = [
+    ("schedule_start", "r"),
+    ("schedule_end", "r"),
+    ("schedule_valid", "r"),
+    ("usage_sum", "c"),
+    ("usage_count", "c"),
+]
+
+DEFAULT_THRESHOLD = 1.5
+
+
+def save_snapshot(
+    path: str,
+    schedule: dict,
+    baseline_state: dict,
+    watermark,
+    thresholds: dict = None,
+    cycle_count: int = 0,
+    sources: dict = None
+) -> None:
+    """
+    Writes a versioned engine snapshot: compiled schedule, running
+    baseline, id dictionaries and the next cycle's watermark.
+
+    Arrays are stored as .npy files so load_snapshot can map them.
+    Each save writes a fresh generation directory, then swaps in the
+    manifest pointing at it, so a crash mid-save leaves the previous
+    snapshot intact. The generation before the current one is kept
+    for readers that have just read the old manifest. Writers hold an
+    exclusive lock, so overlapping saves run one after the other. sources are
+    the source_stamps of the files the snapshot was built from, for
+    is_snapshot_fresh.
+    """
+    if thresholds is None:
+        from pipeline.anomaly import THRESHOLDS
+        thresholds = THRESHOLDS
+
+    arrays = {
+        "schedule_start": schedule["start"],
+        "schedule_end": schedule["end"],
+        "schedule_valid": schedule["valid"],
+        "usage_sum": baseline_state["usage_sum"],
+        "usage_count": baseline_state["usage_count"],
+    }
+
+    with _writer_lock(path):
+        generation = _read_generation(path) + 1
+        generation_path = os.path.join(path, _generation_dir(generation))
+        shutil.rmtree(generation_path, ignore_errors=True)
+        os.makedirs(generation_path)
+
+        for name, _ in ARRAYS:
+            np.save(os.path.join(generation_path, f"{name}.npy"), np.asarray(arrays[name]))
+
+        manifest = {
+            "version": SNAPSHOT_VERSION,
+            "generation": generation,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "watermark_ns": int(np.datetime64(watermark, "ns").astype("int64")),
+            "cycle_count": cycle_count,
+            "schedule_buildings": list(schedule["buildings"]),
+            "baseline_buildings": list(baseline_state["buildings"]),
+            "baseline_resources": list(baseline_state["resources"]),
+            "thresholds": dict(thresholds),
+            "sources": sources or {},
+        }
+        _replace(os.path.join(path, MANIFEST), lambda f: f.write(json.dumps(manifest).encode()))
+
+        # Older generations are no longer referenced (open maps keep their files)
+        for entry in os.listdir(path):
+            if entry.startswith("gen-") and entry < _generation_dir(generation - 1):
+                shutil.rmtree(os.path.join(path, entry), ignore_errors=True)
+
+
+def load_snapshot(path: str) -> dict:
+    """
+    Maps a snapshot written by save_snapshot.
+
+    Returns:
+        dict: 'schedule', 'baseline_state', 'watermark' (datetime),
+        'thresholds', 'cycle_count' and 'sources'
+    """
+    with open(os.path.join(path, MANIFEST)) as f:
+        manifest = json.load(f)
+
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {manifest.get('version')}")
+
+    generation_path = os.path.join(path, _generation_dir(manifest["generation"]))
+    arrays = {
+        name: np.load(os.path.join(generation_path, f"{name}.npy"), mmap_mode=mode)
+        for name, mode in ARRAYS
+    }
+
+    watermark = np.datetime64(manifest["watermark_ns"], "ns").astype("datetime64[us]").astype(datetime)
+
+    return {
+        "schedule": {
+            "buildings": manifest["schedule_buildings"],
+            "start": arrays["schedule_start"],
+            "end": arrays["schedule_end"],
+            "valid": arrays["schedule_valid"],
+        },
+        "baseline_state": {
+            "buildings": manifest["baseline_buildings"],
+            "resources": manifest["baseline_resources"],
+            "usage_sum": arrays["usage_sum"],
+            "usage_count": arrays["usage_count"],
+        },
+        "watermark": watermark,
+        "thresholds": manifest["thresholds"],
+        "cycle_count": manifest["cycle_count"],
+        "sources": manifest.get("sources", {}),
+    }
+
+
+def is_snapshot_fresh(path: str, sources: list) -> bool:
+    """
+    True if a snapshot exists and was built from exactly these source
+    files, none of which has changed since.
+    """
+    try:
+        with open(os.path.join(path, MANIFEST)) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return False
+
+    return (
+        manifest.get("version") == SNAPSHOT_VERSION
+        and sources_match(manifest.get("sources"), sources)
+    )
+
+
+def run_snapshot_cycle(
+    snapshot: dict,
+    records: np.ndarray,
+    dictionary: dict,
+    window_minutes: int = 30
+):
+    """
+    Runs one cycle at the snapshot's watermark straight off a mapped
+    reading log, then advances the watermark.
+
+    Same rules as mark_silence_windows, the running baseline and
+    detect_shadow_waste, on numpy arrays only. Like the app, it stops
+    once the watermark is past the last reading in the log.
+
+    Returns:
+        list: One dict per anomaly (building, resource, usage, baseline_usage),
+        or None if the feed is exhausted (the watermark is not advanced)
+    """
+    current_time = snapshot["watermark"]
+    schedule = snapshot["schedule"]
+    state = snapshot["baseline_state"]
+
+    end_ns = records["timestamp"][-1] if len(records) else None
+    if end_ns is None or np.datetime64(current_time, "ns").astype("int64") > end_ns:
+        return None
+
+    snapshot["watermark"] = current_time + timedelta(minutes=window_minutes)
+    snapshot["cycle_count"] += 1
+
+    # 1️⃣ Window, silent buildings only
+    silent_buildings = get_silent_buildings(schedule, current_time, window_minutes)
+    if not silent_buildings:
+        return []
+
+    window = get_record_window(records, current_time, window_minutes)
+    silent_ids = _id_lookup(dictionary["buildings"], silent_buildings) >= 0
+    window = window[silent_ids[window["building"]]]
+    if len(window) == 0:
+        return []
+
+    # 2️⃣ Silence detection
+    schedule_codes = _id_lookup(dictionary["buildings"], schedule["buildings"])[window["building"]]
+    ts = window["timestamp"]
+    seconds = (ts // 10**9) % (24 * 3600)
+    is_silence = silence_mask(schedule, schedule_codes, seconds)
+
+    # 3️⃣ Baseline: fold the silence rows into the running state
+    b_idx = _register(state, "buildings", dictionary["buildings"])[window["building"]]
+    r_idx = _register(state, "resources", dictionary["resources"])[window["resource"]]
+    usage = window["usage"].astype("float64")
+
+    np.add.at(state["usage_sum"], (b_idx[is_silence], r_idx[is_silence]), usage[is_silence])
+    np.add.at(state["usage_count"], (b_idx[is_silence], r_idx[is_silence]), 1)
+
+    # 4️⃣ Anomaly detection
+    count = state["usage_count"][b_idx, r_idx]
+    baseline = np.divide(
+        state["usage_sum"][b_idx, r_idx], count,
+        out=np.full(len(window), np.nan), where=count > 0
+    )
+    thresholds = np.array([
+        snapshot["thresholds"].get(r, DEFAULT_THRESHOLD) for r in state["resources"]
+    ])
+    is_anomaly = is_silence & (count > 0) & (usage > baseline * thresholds[r_idx])
+
+    return [
+        {
+            "building": state["buildings"][b],
+            "resource": state["resources"][r],
+            "usage": float(u),
+            "baseline_usage": float(base),
+        }
+        for b, r, u, base in zip(
+            b_idx[is_anomaly], r_idx[is_anomaly], usage[is_anomaly], baseline[is_anomaly]
+        )
+    ]
+
+
+def _generation_dir(generation: int) -> str:
+    # Zero-padded so names sort in generation order
+    return f"gen-{generation:010d}"
+
+
+def _read_generation(path: str) -> int:
+    # Generation of the current manifest, 0 if there is none yet
+    try:
+        with open(os.path.join(path, MANIFEST)) as f:
+            return json.load(f).get("generation", 0)
+    except FileNotFoundError:
+        return 0
+
+
+@contextmanager
+def _writer_lock(path: str):
+    # Exclusive lock for one save; the OS drops it if the writer dies
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, LOCK), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _id_lookup(names: list, wanted: list) -> np.ndarray:
+    # For each id in names, its position in wanted (or -1)
+    position = {name: i for i, name in enumerate(wanted)}
+    return np.array([position.get(name, -1) for name in names] + [-1], dtype="int64")
+
+
+def _register(state: dict, key: str, names: list) -> np.ndarray:
+    # Map log ids to baseline rows/columns, growing the tables for new names
+    position = {name: i for i, name in enumerate(state[key])}
+    for name in names:
+        if name not in position:
+            position[name] = len(state[key])
+            state[key].append(name)
+
+    shape = (len(state["buildings"]), len(state["resources"]))
+    if shape != state["usage_sum"].shape:
+        pad = [(0, shape[0] - state["usage_sum"].shape[0]),
+               (0, shape[1] - state["usage_sum"].shape[1])]
+        state["usage_sum"] = np.pad(state["usage_sum"], pad)
+        state["usage_count"] = np.pad(state["usage_count"], pad)
+
+    return np.array([position[name] for name in names], dtype="int64")
+
+
+def _replace(path: str, write) -> None:
+    # Write beside the target, then swap it in; open maps keep the old file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
@@ -0,0 +1,196 @@
+# pipeline/tenancy.py
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import timedelta
+
+import pandas as pd
+
+from pipeline.ingestion import load_usage_logs, load_schedule
+from pipeline.scheduler import get_silent_window, compile_schedule, index_by_building
+from pipeline.silence_detection import mark_silence_compiled
+from pipeline.baseline import init_baseline_state, update_baseline_state, baseline_from_state
+from pipeline.anomaly import detect_shadow_waste
+from pipeline.decision import generate_decision
+
+
+def load_tenants(filepath: str) -> list:
+    """
+    Load every tenant listed in a tenants file.
+    Expected columns:
+    tenant, usage_path, schedule_path
+
+    A tenant that fails to load does not stop the others: it is
+    returned as {"name", "error"} and run_tenants reports the error
+    in its stats without running it.
+    """
+    df = pd.read_csv(filepath)
+
+    tenants = []
+    for _, row in df.iterrows():
+        try:
+            tenants.append(load_tenant(row["tenant"], row["usage_path"], row["schedule_path"]))
+        except Exception as exc:
+            tenants.append({"name": row["tenant"], "error": f"{type(exc).__name__}: {exc}"})
+
+    return tenants
+
+
+def load_tenant(
+    name: str,
+    usage_path: str,
+    schedule_path: str,
+    window_minutes: int = 30
+) -> dict:
+    """
+    Builds one tenant's isolated state: its usage feed and its index,
+    compiled schedule, running baseline, watermark and histories.
+    Usage rows are validated against the tenant's schedule on load.
+    """
+    schedule_df = load_schedule(schedule_path)
+    usage_df = load_usage_logs(
+        usage_path, validate=True, schedule_df=schedule_df, interval_minutes=window_minutes
+    )
+
+    return {
+        "name": name,
+        "usage_df": usage_df,
+        "usage_index": index_by_building(usage_df),
+        "validation": usage_df.attrs["validation"],
+        "schedule": compile_schedule(schedule_df),
+        "baseline_state": init_baseline_state(),
+        "window_minutes": window_minutes,
+        "current_time": usage_df["timestamp"].min() + timedelta(minutes=window_minutes),
+        "end_time": usage_df["timestamp"].max(),
+        "cycle_count": 0,
+        "anomaly_history": [],
+        "decision_history": [],
+    }
+
+
+def run_tenant_cycle(tenant: dict) -> bool:
+    """
+    Runs one scheduled cycle for a tenant.
+    Returns False once the tenant's feed is exhausted.
+    """
+    current_time = tenant["current_time"]
+    window = timedelta(minutes=tenant["window_minutes"])
+
+    if current_time > tenant["end_time"]:
+        return False
+
+    # 1️⃣ Extract time window, silent buildings only
+    window_df = get_silent_window(
+        tenant["usage_df"],
+        current_time,
+        tenant["schedule"],
+        window_minutes=tenant["window_minutes"],
+        index=tenant["usage_index"]
+    )
+
+    tenant["cycle_count"] += 1
+    if window_df.empty:
+        tenant["current_time"] += window
+        return True
+
+    # 2️⃣ Silence detection
+    window_df = mark_silence_compiled(window_df, tenant["schedule"])
+
+    # 3️⃣ Baseline: fold this window into the running state
+    update_baseline_state(tenant["baseline_state"], window_df)
+    baseline = baseline_from_state(tenant["baseline_state"])
+
+    # 4️⃣ Anomaly detection
+    result = detect_shadow_waste(window_df, baseline)
+    result["run_time"] = current_time
+    tenant["anomaly_history"].append(result)
+
+    # 5️⃣ Decisions
+    for _, row in result[result["is_anomaly"]].iterrows():
+        decision = {
+            "tenant": tenant["name"],
+            "cycle": tenant["cycle_count"],
+            "run_time": current_time,
+            **generate_decision(row)
+        }
+        tenant["decision_history"].append(decision)
+
+    # Advance time
+    tenant["current_time"] += window
+    return True
+
+
+def run_tenants(
+    tenants: list,
+    max_workers: int = 4,
+    deadline_seconds: float = None,
+    max_cycles: int = None
+) -> dict:
+    """
+    Runs all tenants' cycles over one shared worker pool.
+
+    A tenant has at most one cycle in flight, so its state is only
+    ever touched by one worker. Each cycle is due deadline_seconds
+    after its tenant became runnable; when a worker frees up, the
+    earliest deadline goes next, ties going to the tenant that has
+    received the least worker time, so a slow or large tenant cannot
+    starve the others. A cycle that raises stops only its own tenant;
+    the error is recorded in that tenant's stats, as is the error of a
+    tenant that failed to load (it is never run).
+
+    Returns:
+        dict: Per-tenant 'cycles', 'busy_seconds', 'missed_deadlines'
+        and 'error' (None unless the tenant was stopped)
+    """
+    stats = {
+        t["name"]: {"cycles": 0, "busy_seconds": 0.0, "missed_deadlines": 0, "error": t.get("error")}
+        for t in tenants
+    }
+    ready_at = {t["name"]: time.perf_counter() for t in tenants}
+    runnable = [t for t in tenants if t.get("error") is None]
+    in_flight = {}
+
+    def due(tenant):
+        if deadline_seconds is None:
+            return 0.0
+        return ready_at[tenant["name"]] + deadline_seconds
+
+    def timed_cycle(tenant):
+        start = time.perf_counter()
+        try:
+            return run_tenant_cycle(tenant), time.perf_counter() - start, None
+        except Exception as exc:
+            return False, time.perf_counter() - start, exc
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while runnable or in_flight:
+
+            # Fill free workers: earliest deadline, then least-served tenant
+            runnable.sort(key=lambda t: (due(t), stats[t["name"]]["busy_seconds"]))
+            while runnable and len(in_flight) < max_workers:
+                tenant = runnable.pop(0)
+                in_flight[pool.submit(timed_cycle, tenant)] = tenant
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                tenant = in_flight.pop(future)
+                progressed, busy, error = future.result()
+
+                tenant_stats = stats[tenant["name"]]
+                tenant_stats["busy_seconds"] += busy
+                if deadline_seconds is not None and time.perf_counter() > due(tenant):
+                    tenant_stats["missed_deadlines"] += 1
+
+                if error is not None:
+                    tenant_stats["error"] = f"{type(error).__name__}: {error}"
+                    continue
+
+                if not progressed:
+                    continue
+
+                tenant_stats["cycles"] += 1
+                if max_cycles is None or tenant_stats["cycles"] < max_cycles:
+                    ready_at[tenant["name"]] = time.perf_counter()
+                    runnable.append(tenant)
+
+    return stats
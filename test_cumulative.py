@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from pipeline.ingestion import load_usage_logs, convert_cumulative_readings
+
+# Load interval usage and rebuild the cumulative registers the meters report
+usage_df = load_usage_logs("data/usage_logs_full.csv")
+
+readings_df = usage_df.copy()
+readings_df["reading"] = readings_df.groupby(["building", "resource"])["usage"].cumsum()
+readings_df = readings_df.drop(columns="usage")
+
+# Water registers wrap at 10,000 units
+capacity = {"water": 10000}
+is_water = readings_df["resource"] == "water"
+readings_df.loc[is_water, "reading"] %= capacity["water"]
+
+# Drop one Library reading to simulate an irregular reporting interval
+readings_df = readings_df.drop(
+    readings_df[(readings_df["building"] == "Library")].index[10]
+)
+
+# Registers are read by timestamp, not in file order
+readings_df = readings_df.sample(frac=1, random_state=0)
+
+converted = convert_cumulative_readings(readings_df, interval_minutes=30, rollover=capacity)
+
+print("[Converted Usage]")
+print(converted.head(12))
+
+# Compare against the original interval usage (after the first reading)
+merged = converted.merge(
+    usage_df,
+    on=["timestamp", "building", "resource"],
+    suffixes=("_converted", "_original")
+)
+exact = np.isclose(merged["usage_converted"], merged["usage_original"])
+
+print(f"\nRows converted : {len(converted)}")
+print(f"Exact matches  : {exact.sum()}")
+print("[Rate-normalised rows]")
+print(merged[~exact])
+
+# With the capacity known, a drop is a rollover unless the wrapped
+# delta is more than the meter could use in one interval
+t0 = pd.Timestamp("2026-02-05 00:00")
+wrap_df = pd.DataFrame({
+    "timestamp": [t0, t0 + pd.Timedelta(minutes=30)] * 2,
+    "building": ["Lab-A"] * 4,
+    "resource": ["water", "water", "electricity", "electricity"],
+    "reading": [8800, 1500, 9600, 5],
+})
+wrapped = convert_cumulative_readings(
+    wrap_df,
+    rollover={"water": 10000, "electricity": 10000},
+    max_usage={"water": 3000, "electricity": 100}
+)
+print("\n[Rollover vs Reset]")
+print(wrapped)
+print("Water 8800 -> 1500 rolled over:", wrapped.loc[wrapped["resource"] == "water", "usage"].item() == 2700)
+print("Electricity 9600 -> 5 reset   :", wrapped.loc[wrapped["resource"] == "electricity", "usage"].item() == 5)
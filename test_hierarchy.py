@@ -0,0 +1,59 @@
+import pandas as pd
+from datetime import timedelta
+
+from pipeline.ingestion import load_usage_logs, load_schedule
+from pipeline.hierarchy import load_meter_hierarchy, compile_hierarchy, roll_up_usage
+from pipeline.scheduler import get_time_window
+from pipeline.silence_detection import mark_silence_windows
+from pipeline.baseline import compute_silence_baseline
+from pipeline.anomaly import detect_shadow_waste
+
+# Load data and compile the hierarchy once
+usage_df = load_usage_logs("data/usage_logs_full.csv")
+schedule = load_schedule("data/demo/schedule.csv")
+hierarchy = compile_hierarchy(load_meter_hierarchy("data/demo/meter_hierarchy.csv"))
+
+# Silence is scheduled per building, so mark it before rolling up
+usage_df = mark_silence_windows(usage_df, schedule)
+
+current_time = usage_df["timestamp"].min() + timedelta(minutes=30)
+window_df = get_time_window(usage_df, current_time, window_minutes=30)
+
+for level in ["building", "zone", "campus"]:
+    print(f"\n=== Level: {level} ===")
+
+    rolled_window = roll_up_usage(window_df, hierarchy, level, from_level="building")
+    rolled_history = roll_up_usage(
+        usage_df[usage_df["timestamp"] < current_time],
+        hierarchy,
+        level,
+        from_level="building"
+    )
+
+    baseline = compute_silence_baseline(rolled_history)
+    result = detect_shadow_waste(rolled_window, baseline)
+
+    print(result)
+
+# Numeric meter ids are labels, not compiled positions
+numeric_hierarchy = compile_hierarchy(pd.DataFrame({
+    "meter": [1001, 1002, 1003, 1004],
+    "building": ["Lab-A", "Lab-A", "Library", None],
+    "zone": ["Academic"] * 4,
+    "campus": ["Main-Campus"] * 4,
+}))
+numeric_df = pd.DataFrame({
+    "timestamp": [current_time] * 4,
+    "meter": [1001, 1002, 1003, 9999],
+    "resource": ["water"] * 4,
+    "usage": [10.0, 5.0, 7.0, 3.0],
+})
+rolled_numeric = roll_up_usage(numeric_df, numeric_hierarchy, "building")
+print("\n=== Numeric Meter Ids ===")
+print(rolled_numeric)
+print(f"Hierarchy rows dropped: {numeric_hierarchy['dropped_rows']}, "
+      f"usage rows dropped: {rolled_numeric.attrs['dropped_rows']}")
+
+# Compiled positions are opt-in
+positions_df = numeric_df.head(3).assign(meter=[0, 1, 2])
+print(roll_up_usage(positions_df, numeric_hierarchy, "building", codes=True))
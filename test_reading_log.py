@@ -0,0 +1,85 @@
+import os
+from datetime import timedelta
+
+from pipeline.ingestion import load_usage_logs
+from pipeline.scheduler import get_time_window
+from pipeline.reading_log import (
+    append_readings,
+    open_reading_log,
+    load_dictionary,
+    get_record_window,
+    records_to_frame,
+    source_stamps,
+    is_log_fresh,
+)
+
+# A scratch log, so the app's warm-start log is left alone
+LOG_PATH = "data/test_reading_log.bin"
+for path in (LOG_PATH, LOG_PATH + ".dict.json"):
+    if os.path.exists(path):
+        os.remove(path)
+
+# Write the CSV feed into the binary log
+sources = source_stamps(["data/usage_logs_full.csv"])
+usage_df = load_usage_logs("data/usage_logs_full.csv")
+written = append_readings(LOG_PATH, usage_df, sources=sources)
+print(f"✅ Wrote {written} records to {LOG_PATH}")
+print("Fresh for its CSV:", is_log_fresh(LOG_PATH, ["data/usage_logs_full.csv"]))
+print("Fresh for another CSV:", is_log_fresh(LOG_PATH, ["data/demo/usage_logs.csv"]))
+
+# Map it (zero-copy, shared page cache)
+records = open_reading_log(LOG_PATH)
+dictionary = load_dictionary(LOG_PATH)
+
+print(f"Records in log: {len(records)}")
+print(f"Buildings: {dictionary['buildings']}")
+print(f"Resources: {dictionary['resources']}")
+
+# Extract one 30-minute window, same as get_time_window
+first_ts = records_to_frame(records[:1], dictionary)["timestamp"].iloc[0]
+current_time = first_ts + timedelta(minutes=30)
+
+window = get_record_window(records, current_time, window_minutes=30)
+window_df = records_to_frame(window, dictionary)
+
+print("Current Time:", current_time)
+print("Window Data:")
+print(window_df)
+
+expected_df = get_time_window(
+    load_usage_logs("data/usage_logs_full.csv"), current_time, 30
+).reset_index(drop=True)
+print("Matches CSV window:", len(expected_df) == len(window_df) and (
+    (window_df["timestamp"] == expected_df["timestamp"]) &
+    (window_df["building"] == expected_df["building"]) &
+    (window_df["resource"] == expected_df["resource"]) &
+    (window_df["usage"] == expected_df["usage"])
+).all())
+
+os.remove(LOG_PATH)
+os.remove(LOG_PATH + ".dict.json")
+
+# A torn tail (interrupted write) must not misalign later appends
+TORN_PATH = "data/torn_tail.bin"
+for path in (TORN_PATH, TORN_PATH + ".dict.json"):
+    if os.path.exists(path):
+        os.remove(path)
+
+usage_df = load_usage_logs("data/usage_logs_full.csv")
+append_readings(TORN_PATH, usage_df.iloc[:12])
+with open(TORN_PATH, "ab") as f:
+    f.write(b"\x00" * 5)
+append_readings(TORN_PATH, usage_df.iloc[12:24])
+
+torn_df = records_to_frame(open_reading_log(TORN_PATH), load_dictionary(TORN_PATH))
+expected = usage_df.iloc[:24].reset_index(drop=True)
+print("\n[Torn Tail]")
+print(f"Records after torn append: {len(torn_df)}")
+print("Matches CSV rows:", (
+    (torn_df["timestamp"] == expected["timestamp"]) &
+    (torn_df["building"] == expected["building"]) &
+    (torn_df["usage"] == expected["usage"])
+).all())
+
+os.remove(TORN_PATH)
+os.remove(TORN_PATH + ".dict.json")
@@ -0,0 +1,62 @@
+import pandas as pd
+
+from pipeline.ingestion import load_usage_logs, load_schedule, validate_usage_logs
+from pipeline.silence_detection import mark_silence_windows
+from pipeline.baseline import compute_silence_baseline
+
+# Load full usage dataset
+usage_df = load_usage_logs("data/usage_logs_full.csv")
+schedule = load_schedule("data/demo/schedule.csv")
+
+# Simulate a messy feed: re-uploaded rows, a negative reading,
+# an unknown building and one missing interval
+first = usage_df.iloc[0]
+messy_df = pd.concat([
+    usage_df,
+    usage_df.head(4),
+    pd.DataFrame([
+        {**first, "building": "Unknown-Block"},
+        {**first, "usage": -10},
+    ]),
+], ignore_index=True)
+messy_df = messy_df[messy_df["timestamp"] != usage_df["timestamp"].iloc[24]]
+
+clean_df, report = validate_usage_logs(messy_df, schedule, interval_minutes=30)
+
+print("\n[Validation Stats]")
+for key, value in report["stats"].items():
+    print(f"{key:24}: {value}")
+
+print("\n[Quarantined Rows]")
+print(report["quarantine"])
+
+print("\n[Detected Gaps]")
+print(report["gaps"])
+
+# Sub-meters of one building reporting together are not duplicates
+sub_meter_df = usage_df.head(2).assign(meter="Main")
+sub_meter_df = pd.concat([sub_meter_df, sub_meter_df.assign(meter="Pump")], ignore_index=True)
+clean_sub_df, sub_report = validate_usage_logs(sub_meter_df, schedule)
+print("\n[Sub-Meter Rows Kept]")
+print(f"{len(clean_sub_df)} of {len(sub_meter_df)} (duplicates: {sub_report['stats']['duplicates']})")
+
+# A streaming window holds one reading per meter, so judge spikes
+# against the learned baseline instead of the window's own median
+baseline = compute_silence_baseline(mark_silence_windows(usage_df, schedule))
+window_df = usage_df.tail(12).copy()
+window_df.iloc[0, window_df.columns.get_loc("usage")] = 1_000_000
+
+_, window_report = validate_usage_logs(window_df, schedule, baseline_df=baseline)
+print("\n[Streaming Window Spikes]")
+print(window_report["quarantine"])
+
+# A malformed re-upload must not displace the valid reading it repeats
+reupload_df = pd.concat([
+    usage_df.head(2),
+    usage_df.head(1).assign(usage=-10),
+], ignore_index=True)
+clean_reupload_df, reupload_report = validate_usage_logs(reupload_df, schedule)
+print("\n[Malformed Re-Upload]")
+print(f"{len(clean_reupload_df)} of {len(reupload_df)} kept, "
+      f"quarantined: {reupload_report['stats']['quarantined_by_reason']}")
+print(clean_reupload_df)